@@ -164,16 +164,18 @@ def main():
         FPSCLOCK.tick(FPS)
 
 def getNumLiveNeighbors(x, y, currArray):
+    width, height = currArray.shape # the board wraps around at its own edges
     retVal = 0
     for i in range(x-1, x+2): # range() excludes the last element
         for j in range(y-1, y+2):
-            if currArray[i%CELLWIDTH][j%CELLHEIGHT] == True and not (i%CELLWIDTH == x and j%CELLHEIGHT == y):
+            if currArray[i%width][j%height] == True and not (i%width == x and j%height == y):
                 retVal += 1
     return retVal
 
 def iterate(prevCellArray):
-    currCellArray = np.arange(CELLWIDTH*CELLHEIGHT)
-    currCellArray.shape = (CELLWIDTH, CELLHEIGHT)
+    width, height = prevCellArray.shape
+    currCellArray = np.arange(width*height)
+    currCellArray.shape = (width, height)
     # set all cells to be inactive
     currCellArray[:] = False
             
@@ -191,8 +193,8 @@ def iterate(prevCellArray):
                 # need to check dead neighbors of every live cell
                 for k in range(i-1,i+2): # range() is exclusive
                     for l in range(j-1,j+2):
-                        if getNumLiveNeighbors(k%CELLWIDTH,l%CELLHEIGHT, prevCellArray) == 3:
-                            currCellArray[k%CELLWIDTH][l%CELLHEIGHT] = True  # reproduction
+                        if getNumLiveNeighbors(k%width,l%height, prevCellArray) == 3:
+                            currCellArray[k%width][l%height] = True  # reproduction
                                  
     return currCellArray
     
@@ -351,6 +353,7 @@ def createBlinker(xCenter, yCenter):
     # test a blinker
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     retArray[xCenter][yCenter] = True
     retArray[xCenter][yCenter-1] = True
     retArray[xCenter][yCenter+1] = True
@@ -360,6 +363,7 @@ def createBeacon(xCenter, yCenter):
     # test a blinker
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     retArray[xCenter][yCenter] = True
     retArray[xCenter+1][yCenter] = True
     retArray[xCenter][yCenter+1] = True
@@ -374,6 +378,7 @@ def createBeacon(xCenter, yCenter):
 def createToad(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     retArray[xCenter][yCenter] = True
     retArray[xCenter+1][yCenter] = True
     retArray[xCenter-1][yCenter] = True
@@ -386,6 +391,7 @@ def createToad(xCenter, yCenter):
 def createDirtyPuffer(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     # top part
     retArray[xCenter][yCenter-6] = True
     retArray[xCenter-1][yCenter-6] = True
@@ -418,6 +424,7 @@ def createGlider(xCenter, yCenter):
     # test a blinker
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     retArray[xCenter-1][yCenter-1] = True
     retArray[xCenter][yCenter] = True
     retArray[xCenter+1][yCenter] = True
@@ -428,6 +435,7 @@ def createGlider(xCenter, yCenter):
 def createLWSS(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     
     retArray[xCenter][yCenter] = True
     retArray[xCenter-1][yCenter] = True
@@ -443,6 +451,7 @@ def createLWSS(xCenter, yCenter):
 def createCleanPuffer(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     # bottom part
     retArray[xCenter][yCenter] = True
     retArray[xCenter][yCenter+1] = True
@@ -479,6 +488,7 @@ def createCleanPuffer(xCenter, yCenter):
 def createC5spaceship(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     # middle piece
     retArray[xCenter-1][yCenter] = True
     retArray[xCenter-1][yCenter-1] = True
@@ -546,6 +556,7 @@ def createC5spaceship(xCenter, yCenter):
 def createGliderGun(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     # left side
     retArray[xCenter][yCenter] = True
     retArray[xCenter+1][yCenter-2] = True
@@ -590,6 +601,7 @@ def createGliderGun(xCenter, yCenter):
 def createPulsar(xCenter, yCenter):
     retArray = np.arange(CELLWIDTH*CELLHEIGHT)
     retArray.shape = (CELLWIDTH, CELLHEIGHT)
+    retArray[:] = False
     # left side
     retArray[xCenter-1][yCenter-2] = True
     retArray[xCenter-1][yCenter-3] = True
@@ -0,0 +1,259 @@
+import os, time, hashlib, argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from conways_game_of_life import iterate, CELLWIDTH, CELLHEIGHT, XCENTER, YCENTER
+from conways_game_of_life import createBlinker, createBeacon, createToad, createDirtyPuffer, createGlider
+from conways_game_of_life import createLWSS, createCleanPuffer, createC5spaceship, createGliderGun, createPulsar
+
+'''
+ Runs many starting configurations without opening a window and records how each one evolves.
+
+ A sweep is a grid of parameters: every built-in pattern at every offset, plus random soups for
+ every combination of board size, density and seed. Patterns that run off an edge of the board
+ at their offset wrap around to the opposite edge, like everything else on the board.
+
+ The jobs are split into chunks that run on a process pool. Each finished chunk is written to
+ the checkpoint directory, so an interrupted sweep started again with the same checkpoint
+ directory only runs the jobs that are missing. Every row records the generation and time
+ limits it ran with, and rows that ran with other limits than the current sweep are run again
+ instead of reused. If a chunk fails, its jobs are saved with the status 'error'. Jobs that
+ timed out or failed count as finished, so a completed sweep run again does nothing;
+ --retry-timeouts and --retry-errors run them again. When every job is done the checkpoints
+ are merged into one .npz file with one array per column.
+
+ A job stops when the board dies out, when it returns to an earlier state (still life or
+ oscillator), when it reaches the generation limit or when it runs out of time.
+'''
+
+MAXGENERATIONS = 500
+TIMELIMIT = 60.0 # seconds per job
+CHUNKSIZE = 8    # jobs per work unit sent to a worker process
+
+# default parameter grid
+OFFSETS = [(int(XCENTER), int(YCENTER)), (int(XCENTER) - 10, int(YCENTER) - 10), (int(XCENTER) + 10, int(YCENTER) + 10)]
+DENSITIES = [0.1, 0.2, 0.3, 0.4, 0.5]
+BOARDSIZES = [(CELLWIDTH, CELLHEIGHT), (32, 32)]
+SEEDS = range(10)
+
+PATTERNS = {
+    'blinker'      : createBlinker,
+    'beacon'       : createBeacon,
+    'toad'         : createToad,
+    'dirtyPuffer'  : createDirtyPuffer,
+    'glider'       : createGlider,
+    'lwss'         : createLWSS,
+    'cleanPuffer'  : createCleanPuffer,
+    'c5spaceship'  : createC5spaceship,
+    'gliderGun'    : createGliderGun,
+    'pulsar'       : createPulsar,
+}
+
+# statuses that can be run again on resume with --retry-timeouts / --retry-errors
+RETRYSTATUSES = ['timeout', 'error']
+
+# columns of the checkpoint and output files, in order
+COLUMNS = ['key', 'pattern', 'x', 'y', 'width', 'height', 'density', 'seed', 'maxGenerations', 'timeLimit',
+           'status', 'generations', 'period', 'initialPopulation', 'finalPopulation', 'maxPopulation', 'seconds']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep Game of Life starting configurations.')
+    parser.add_argument('output', help='.npz file the aggregated results are written to')
+    parser.add_argument('--patterns', nargs='*', choices=sorted(PATTERNS), default=sorted(PATTERNS),
+                        metavar='NAME', help='built-in patterns to run (%s)' % ', '.join(sorted(PATTERNS)))
+    parser.add_argument('--offsets', nargs='*', type=parseOffset, default=OFFSETS, metavar='X,Y',
+                        help='cells the patterns are centered on')
+    parser.add_argument('--densities', nargs='*', type=float, default=DENSITIES, metavar='D',
+                        help='fraction of live cells in the random soups')
+    parser.add_argument('--board-sizes', nargs='*', type=parseBoardSize, default=BOARDSIZES, metavar='WxH',
+                        help='board sizes of the random soups, in cells')
+    parser.add_argument('--seeds', nargs='*', type=int, default=list(SEEDS), metavar='N',
+                        help='random seeds of the soups')
+    parser.add_argument('--checkpoint-dir', default='sweep_checkpoints')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=CHUNKSIZE)
+    parser.add_argument('--max-generations', type=int, default=MAXGENERATIONS)
+    parser.add_argument('--time-limit', type=float, default=TIMELIMIT)
+    parser.add_argument('--retry-timeouts', action='store_true', help='run jobs that timed out again')
+    parser.add_argument('--retry-errors', action='store_true', help='run jobs that failed again')
+    args = parser.parse_args(argv)
+
+    jobs = buildJobs(args.patterns, args.offsets, args.densities, args.board_sizes, args.seeds)
+    retryStatuses = [status for status, retry in [('timeout', args.retry_timeouts), ('error', args.retry_errors)]
+                     if retry]
+    runSweep(jobs, args.output, args.checkpoint_dir, args.workers, args.chunk_size,
+             args.max_generations, args.time_limit, retryStatuses)
+
+def parseOffset(text):
+    # '32,24' -> (32, 24)
+    try:
+        x, y = text.split(',')
+        return (int(x), int(y))
+    except ValueError:
+        raise argparse.ArgumentTypeError('offset must look like X,Y, not %r' % text)
+
+def parseBoardSize(text):
+    # '64x48' -> (64, 48)
+    try:
+        width, height = text.lower().split('x')
+        return (int(width), int(height))
+    except ValueError:
+        raise argparse.ArgumentTypeError('board size must look like WIDTHxHEIGHT, not %r' % text)
+
+def buildJobs(patterns, offsets, densities, boardSizes, seeds):
+    # every pattern at every offset, then a soup for every board size/density/seed combination
+    jobs = []
+    for pattern in patterns:
+        for x, y in offsets:
+            jobs.append({'key': 'pattern/%s/%d/%d' % (pattern, x, y), 'pattern': pattern,
+                         'x': x, 'y': y, 'width': CELLWIDTH, 'height': CELLHEIGHT,
+                         'density': 0.0, 'seed': -1})
+    for width, height in boardSizes:
+        for density in densities:
+            for seed in seeds:
+                jobs.append({'key': 'soup/%dx%d/%g/%d' % (width, height, density, seed), 'pattern': 'soup',
+                             'x': -1, 'y': -1, 'width': width, 'height': height,
+                             'density': density, 'seed': seed})
+    return jobs
+
+def runSweep(jobs, outputFile, checkpointDir, workers=None, chunkSize=CHUNKSIZE,
+             maxGenerations=MAXGENERATIONS, timeLimit=TIMELIMIT, retryStatuses=()):
+    if not os.path.isdir(checkpointDir):
+        os.makedirs(checkpointDir)
+
+    # skip the jobs an earlier run with the same limits already finished, unless they are retried
+    doneKeys = set(key for key, result in loadResults(checkpointDir, maxGenerations, timeLimit).items()
+                   if result['status'] not in retryStatuses)
+    remaining = [job for job in jobs if job['key'] not in doneKeys]
+    chunks = [remaining[i:i+chunkSize] for i in range(0, len(remaining), chunkSize)]
+    print('%d of %d jobs already done, running %d jobs in %d chunks'
+          % (len(jobs) - len(remaining), len(jobs), len(remaining), len(chunks)))
+
+    # number new checkpoints after the highest existing one so no finished chunk is overwritten
+    chunkNumber = max([checkpointNumber(name) for name in listCheckpoints(checkpointDir)] + [-1]) + 1
+    # only keep one chunk per worker in flight, so an interrupted sweep has nothing queued to wait for
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {} # future -> chunk it is running
+    try:
+        while chunks or pending:
+            while chunks and len(pending) < workers:
+                chunk = chunks.pop(0)
+                pending[executor.submit(runChunk, chunk, maxGenerations, timeLimit)] = chunk
+            done, notDone = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as error:
+                    # keep the other chunks going and record the failed jobs
+                    print('chunk of %d jobs failed: %r' % (len(chunk), error))
+                    results = [newResult(job, maxGenerations, timeLimit, 'error') for job in chunk]
+                saveColumns(os.path.join(checkpointDir, 'chunk-%06d.npz' % chunkNumber), results)
+                chunkNumber += 1
+    except BaseException:
+        # Ctrl-C or a failed save: stop right away, the saved checkpoints let the sweep resume
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    # merge the checkpoints, keeping only the jobs that belong to this sweep, in job order
+    resultsByKey = loadResults(checkpointDir, maxGenerations, timeLimit)
+    results = [resultsByKey[job['key']] for job in jobs if job['key'] in resultsByKey]
+    saveColumns(outputFile, results)
+    print('wrote %d results to %s' % (len(results), outputFile))
+
+def runChunk(jobs, maxGenerations, timeLimit):
+    return [runJob(job, maxGenerations, timeLimit) for job in jobs]
+
+def runJob(job, maxGenerations, timeLimit):
+    startTime = time.time()
+    result = newResult(job, maxGenerations, timeLimit, 'maxgen')
+    state = makeInitialState(job)
+    population = countLiveCells(state)
+    result['initialPopulation'] = result['finalPopulation'] = result['maxPopulation'] = population
+    seen = {stateDigest(state): 0} # digest of every state so far -> generation it was seen in
+    generation = 0
+    while generation < maxGenerations:
+        if time.time() - startTime > timeLimit:
+            result['status'] = 'timeout'
+            break
+        state = iterate(state)
+        generation += 1
+        population = countLiveCells(state)
+        result['maxPopulation'] = max(result['maxPopulation'], population)
+        if population == 0:
+            result['status'] = 'extinct'
+            break
+        digest = stateDigest(state)
+        if digest in seen:
+            result['period'] = generation - seen[digest]
+            result['status'] = 'stable' if result['period'] == 1 else 'periodic'
+            break
+        seen[digest] = generation
+
+    result['generations'] = generation
+    result['finalPopulation'] = population
+    result['seconds'] = time.time() - startTime
+    return result
+
+def newResult(job, maxGenerations, timeLimit, status):
+    result = dict(job)
+    result.update({'maxGenerations': maxGenerations, 'timeLimit': timeLimit, 'status': status,
+                   'generations': 0, 'period': 0, 'initialPopulation': 0, 'finalPopulation': 0,
+                   'maxPopulation': 0, 'seconds': 0.0})
+    return result
+
+def makeInitialState(job):
+    if job['pattern'] == 'soup':
+        rng = np.random.RandomState(job['seed'])
+        soup = rng.random_sample((job['width'], job['height'])) < job['density']
+        return soup.astype(int)
+    # build the pattern at the center, then move it to its offset; the board is a torus so a
+    # pattern that runs off any edge wraps around to the opposite one
+    xCenter, yCenter = int(XCENTER), int(YCENTER)
+    state = PATTERNS[job['pattern']](xCenter, yCenter)
+    return np.roll(state, (job['x'] - xCenter, job['y'] - yCenter), axis=(0, 1))
+
+def countLiveCells(state):
+    return int(np.count_nonzero(state == True))
+
+def stateDigest(state):
+    return hashlib.sha1((state == True).tobytes()).digest()
+
+def listCheckpoints(checkpointDir):
+    return [os.path.join(checkpointDir, name) for name in sorted(os.listdir(checkpointDir))
+            if name.startswith('chunk-') and name.endswith('.npz')]
+
+def checkpointNumber(fileName):
+    # 'ck/chunk-000012.npz' -> 12
+    return int(os.path.basename(fileName)[len('chunk-'):-len('.npz')])
+
+def loadResults(checkpointDir, maxGenerations, timeLimit):
+    # key -> result for every checkpointed job that ran with these limits; a finished result
+    # wins over one that has to be retried
+    results = {}
+    for checkpoint in listCheckpoints(checkpointDir):
+        columns = loadColumns(checkpoint)
+        for i in range(len(columns['key'])):
+            if columns['maxGenerations'][i] != maxGenerations or columns['timeLimit'][i] != timeLimit:
+                continue
+            key = columns['key'][i]
+            if key in results and results[key]['status'] not in RETRYSTATUSES:
+                continue
+            results[key] = dict((name, columns[name][i]) for name in COLUMNS)
+    return results
+
+def loadColumns(fileName):
+    with np.load(fileName) as data:
+        return dict((name, data[name].tolist()) for name in COLUMNS)
+
+def saveColumns(fileName, results):
+    # write to a temporary file first so an interrupted run never leaves half a file behind
+    tempName = fileName + '.tmp'
+    with open(tempName, 'wb') as f:
+        np.savez(f, **dict((name, np.array([result[name] for result in results])) for name in COLUMNS))
+    os.replace(tempName, fileName)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+import os, signal, threading, time
+import numpy as np
+import pytest
+import sweep
+
+
+def test_build_jobs():
+    jobs = sweep.buildJobs(['blinker', 'glider'], [(10, 10), (20, 5)], [0.1, 0.5], [(8, 8)], range(3))
+    assert len(jobs) == 2 * 2 + 2 * 3
+    assert jobs[0]['key'] == 'pattern/blinker/10/10'
+    assert jobs[4]['key'] == 'soup/8x8/0.1/0'
+    assert len(set(job['key'] for job in jobs)) == len(jobs)
+
+
+def test_blinker_is_periodic():
+    job = sweep.buildJobs(['blinker'], [(10, 10)], [], [], [])[0]
+    result = sweep.runJob(job, 10, 30)
+    assert (result['status'], result['period'], result['generations']) == ('periodic', 2, 2)
+
+
+def test_block_is_stable(monkeypatch):
+    def createBlock(xCenter, yCenter):
+        board = np.zeros((sweep.CELLWIDTH, sweep.CELLHEIGHT), dtype=int)
+        board[xCenter:xCenter+2, yCenter:yCenter+2] = True
+        return board
+    monkeypatch.setitem(sweep.PATTERNS, 'block', createBlock)
+    job = sweep.buildJobs(['block'], [(10, 10)], [], [], [])[0]
+    result = sweep.runJob(job, 10, 30)
+    assert (result['status'], result['period'], result['finalPopulation']) == ('stable', 1, 4)
+
+
+def test_empty_soup_dies_out():
+    job = sweep.buildJobs([], [], [0.0], [(8, 8)], [0])[0]
+    result = sweep.runJob(job, 10, 30)
+    assert (result['status'], result['generations'], result['finalPopulation']) == ('extinct', 1, 0)
+
+
+def test_resumed_sweep_runs_nothing_and_keeps_job_order(tmp_path, capsys):
+    checkpointDir, outputFile = str(tmp_path / 'ck'), str(tmp_path / 'out.npz')
+    jobs = sweep.buildJobs(['blinker'], [(10, 10)], [0.0, 0.5], [(8, 8)], range(2))
+    sweep.runSweep(jobs, outputFile, checkpointDir, 2, 2, 20, 30)
+    first = sweep.loadColumns(outputFile)
+    assert first['key'] == [job['key'] for job in jobs]
+    capsys.readouterr()
+
+    sweep.runSweep(jobs, outputFile, checkpointDir, 2, 2, 20, 30)
+    assert '5 of 5 jobs already done, running 0 jobs' in capsys.readouterr().out
+    assert sweep.loadColumns(outputFile) == first
+
+
+def test_checkpoints_with_other_limits_are_not_reused(tmp_path):
+    checkpointDir, outputFile = str(tmp_path / 'ck'), str(tmp_path / 'out.npz')
+    jobs = sweep.buildJobs(['glider'], [(10, 10)], [], [], [])
+    sweep.runSweep(jobs, outputFile, checkpointDir, 1, 1, 20, 30)
+    sweep.runSweep(jobs, outputFile, checkpointDir, 1, 1, 5, 30)
+    assert sweep.loadColumns(outputFile)['generations'] == [5]
+
+
+def test_blinker_starts_with_three_live_cells():
+    job = sweep.buildJobs(['blinker'], [(10, 10)], [], [], [])[0]
+    assert sweep.countLiveCells(sweep.makeInitialState(job)) == 3
+    assert sweep.runJob(job, 10, 30)['initialPopulation'] == 3
+
+
+def test_patterns_wrap_around_every_edge():
+    # the glider gun reaches 14 cells left, 21 right, 5 up and 3 down of its center
+    xCenter, yCenter = int(sweep.XCENTER), int(sweep.YCENTER)
+    centered = sweep.createGliderGun(xCenter, yCenter)
+    offsets = [(2, yCenter), (sweep.CELLWIDTH - 2, yCenter), (xCenter, 1), (xCenter, sweep.CELLHEIGHT - 1)]
+    for job in sweep.buildJobs(['gliderGun'], offsets, [], [], []):
+        state = sweep.makeInitialState(job)
+        assert sweep.countLiveCells(state) == 36
+        assert (np.roll(state, (xCenter - job['x'], yCenter - job['y']), axis=(0, 1)) == centered).all()
+        assert sweep.runJob(job, 0, 30)['initialPopulation'] == 36
+
+
+def test_new_checkpoints_never_overwrite_old_ones(tmp_path):
+    checkpointDir = str(tmp_path / 'ck')
+    jobs = sweep.buildJobs(['blinker', 'toad', 'beacon'], [(10, 10)], [], [], [])
+    sweep.runSweep(jobs[:2], str(tmp_path / 'out.npz'), checkpointDir, 1, 1, 10, 30)
+    (tmp_path / 'ck' / 'chunk-000000.npz').unlink()
+    sweep.runSweep(jobs, str(tmp_path / 'out.npz'), checkpointDir, 1, 1, 10, 30)
+    keys = [sweep.loadColumns(name)['key'] for name in sweep.listCheckpoints(checkpointDir)]
+    assert sorted(key for chunk in keys for key in chunk) == sorted(job['key'] for job in jobs)
+
+
+def test_failed_chunks_are_saved_as_errors_and_retried_on_request(tmp_path, capsys):
+    checkpointDir = str(tmp_path / 'ck')
+    jobs = sweep.buildJobs(['blinker', 'noSuchPattern'], [(10, 10)], [], [], [])
+    sweep.runSweep(jobs, str(tmp_path / 'out.npz'), checkpointDir, 1, 1, 10, 30)
+    output = sweep.loadColumns(str(tmp_path / 'out.npz'))
+    assert output['status'] == ['periodic', 'error']
+    capsys.readouterr()
+    sweep.runSweep(jobs, str(tmp_path / 'out.npz'), checkpointDir, 1, 1, 10, 30)
+    assert '2 of 2 jobs already done' in capsys.readouterr().out
+    sweep.runSweep(jobs, str(tmp_path / 'out.npz'), checkpointDir, 1, 1, 10, 30, ['error'])
+    assert '1 of 2 jobs already done' in capsys.readouterr().out
+
+
+def test_timeouts_are_final_unless_retried(tmp_path, capsys):
+    checkpointDir, outputFile = str(tmp_path / 'ck'), str(tmp_path / 'out.npz')
+    jobs = sweep.buildJobs(['glider'], [(10, 10)], [], [], [])
+    sweep.runSweep(jobs, outputFile, checkpointDir, 1, 1, 10, 0.0)
+    assert sweep.loadColumns(outputFile)['status'] == ['timeout']
+    capsys.readouterr()
+    sweep.runSweep(jobs, outputFile, checkpointDir, 1, 1, 10, 0.0)
+    assert '1 of 1 jobs already done' in capsys.readouterr().out
+    sweep.runSweep(jobs, outputFile, checkpointDir, 1, 1, 10, 0.0, ['timeout'])
+    assert '0 of 1 jobs already done' in capsys.readouterr().out
+
+
+def test_interrupted_sweep_returns_promptly_and_can_resume(tmp_path, capsys):
+    checkpointDir, outputFile = str(tmp_path / 'ck'), str(tmp_path / 'out.npz')
+    jobs = sweep.buildJobs([], [], [0.3], [(24, 24)], range(40))
+    timer = threading.Timer(0.5, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    startTime = time.time()
+    with pytest.raises(KeyboardInterrupt):
+        sweep.runSweep(jobs, outputFile, checkpointDir, 2, 1, 30, 30)
+    assert time.time() - startTime < 3.0
+    saved = len(sweep.listCheckpoints(checkpointDir))
+    assert 0 < saved < len(jobs)
+    assert not os.path.exists(outputFile)
+
+    capsys.readouterr()
+    sweep.runSweep(jobs, outputFile, checkpointDir, 2, 1, 30, 30)
+    assert '%d of %d jobs already done' % (saved, len(jobs)) in capsys.readouterr().out
+    assert sweep.loadColumns(outputFile)['key'] == [job['key'] for job in jobs]
+
+
+def test_command_line_grid(tmp_path):
+    outputFile = str(tmp_path / 'out.npz')
+    sweep.main([outputFile, '--checkpoint-dir', str(tmp_path / 'ck'), '--workers', '1',
+                '--max-generations', '5', '--patterns', 'blinker', 'toad', '--offsets', '10,10',
+                '--densities', '0.2', '--board-sizes', '8x8', '12x10', '--seeds', '3'])
+    assert sweep.loadColumns(outputFile)['key'] == ['pattern/blinker/10/10', 'pattern/toad/10/10',
+                                                    'soup/8x8/0.2/3', 'soup/12x10/0.2/3']
+
+
+def test_command_line_rejects_bad_grid_values(tmp_path):
+    for option, value in [('--offsets', '10'), ('--board-sizes', '8by8'), ('--patterns', 'nope')]:
+        with pytest.raises(SystemExit):
+            sweep.main([str(tmp_path / 'out.npz'), option, value])